@@ -3,16 +3,18 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import functools
 import logging
 import time
 from typing import Any
 
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import HumanMessage, SystemMessage
 from langgraph.prebuilt import create_react_agent
 
 from llm_provider import build_llm
 from policy import ToolPolicy
-from smash_api_client import SmashAPIClient
+from smash_api_client import get_async_client, get_client
 from tools import build_tools
 
 LOGGER = logging.getLogger("smash_agent")
@@ -34,6 +36,28 @@ Rules:
 """
 
 
+@functools.lru_cache(maxsize=8)
+def build_agent_tools(
+    *,
+    api_base_url: str = "https://server.cetacean-tuna.ts.net",
+    include_high_intensity: bool = True,
+) -> tuple[Any, ...]:
+    """Return the tool set for an API endpoint; shared so tool result caches are shared too."""
+    client = get_client(api_base_url)
+    policy = ToolPolicy()
+    return tuple(
+        build_tools(
+            client,
+            policy,
+            include_high_intensity=include_high_intensity,
+            async_client=get_async_client(api_base_url),
+        )
+    )
+
+
+# The compiled graph holds no per-session state (history is passed on every
+# invoke), so callers with identical config can share one instance.
+@functools.lru_cache(maxsize=8)
 def build_agent(
     *,
     provider: str = "ollama",
@@ -42,13 +66,11 @@ def build_agent(
     api_base_url: str = "https://server.cetacean-tuna.ts.net",
     include_high_intensity: bool = True,
 ) -> Any:
-    client = SmashAPIClient(base_url=api_base_url)
-    policy = ToolPolicy()
-    tools = build_tools(client, policy, include_high_intensity=include_high_intensity)
+    tools = list(build_agent_tools(api_base_url=api_base_url, include_high_intensity=include_high_intensity))
 
     llm = build_llm(provider, model, base_url=base_url)
     llm_with_tools = llm.bind_tools(tools)
-    return create_react_agent(llm_with_tools, tools, prompt=SYSTEM_PROMPT)
+    return create_react_agent(llm_with_tools, tools, prompt=SystemMessage(content=SYSTEM_PROMPT))
 
 
 def run_query(agent: Any, query: str) -> dict[str, Any]:
@@ -59,9 +81,29 @@ def run_query(agent: Any, query: str) -> dict[str, Any]:
     return result
 
 
+async def run_queries(agent: Any, queries: list[str]) -> list[dict[str, Any]]:
+    """Run ``queries`` concurrently on one event loop; results keep the input order.
+
+    With async tools the runs share the API connection pool and the tool caches
+    instead of each blocking on its own round trips.
+    """
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(agent.ainvoke({"messages": [HumanMessage(content=query)]}) for query in queries)
+    )
+    elapsed_ms = int((time.perf_counter() - started) * 1000)
+    LOGGER.info("Agent completed %d queries in %d ms", len(queries), elapsed_ms)
+    return list(results)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Run Smash agent.")
-    parser.add_argument("--query", required=True, help="User question to ask the agent.")
+    query_source = parser.add_mutually_exclusive_group(required=True)
+    query_source.add_argument("--query", help="User question to ask the agent.")
+    query_source.add_argument(
+        "--queries-file",
+        help="File with one question per line; all are run concurrently.",
+    )
     parser.add_argument("--provider", default="ollama", choices=["ollama", "openai"], help="LLM provider.")
     parser.add_argument("--model", default=None, help="Model name (default: provider-specific).")
     parser.add_argument("--base-url", default="http://localhost:11434", help="Ollama base URL.")
@@ -85,8 +127,18 @@ def main() -> None:
         api_base_url=args.api_base_url,
         include_high_intensity=not args.disable_high_intensity,
     )
-    result = run_query(agent, args.query)
-    print(result["messages"][-1].content)
+    if args.query is not None:
+        result = run_query(agent, args.query)
+        print(result["messages"][-1].content)
+        return
+
+    with open(args.queries_file, encoding="utf-8") as handle:
+        queries = [line.strip() for line in handle if line.strip()]
+    results = asyncio.run(run_queries(agent, queries))
+    for query, result in zip(queries, results):
+        print(f"Q: {query}")
+        print(result["messages"][-1].content)
+        print()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,90 @@
+"""Process-wide agent registry configured from environment variables."""
+
+from __future__ import annotations
+
+import os
+from typing import Any
+
+AGENT_MODES = ("api", "sql")
+
+
+def get_llm_config() -> dict:
+    """Return provider, model, and base_url from environment."""
+    provider = os.getenv("LLM_PROVIDER", "ollama")
+    if provider == "openai":
+        model = os.getenv("OPENAI_MODEL", "gpt-5.2")
+    else:
+        model = os.getenv("OLLAMA_MODEL", "qwen3:14b")
+    base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+    return {"provider": provider, "model": model, "base_url": base_url}
+
+
+def enabled_modes() -> tuple[str, ...]:
+    """Return the agent modes listed in SMASH_AGENT_MODES (default: all)."""
+    requested = os.getenv("SMASH_AGENT_MODES", ",".join(AGENT_MODES))
+    modes = tuple(
+        mode for mode in (part.strip().lower() for part in requested.split(",")) if mode in AGENT_MODES
+    )
+    return modes or AGENT_MODES
+
+
+def _api_tool_config() -> dict:
+    api_base_url = os.getenv("SMASH_API_BASE_URL", "https://server.cetacean-tuna.ts.net")
+    include_high_intensity = os.getenv("DISABLE_HIGH_INTENSITY", "false").lower() not in {
+        "1",
+        "true",
+        "yes",
+    }
+    return {"api_base_url": api_base_url, "include_high_intensity": include_high_intensity}
+
+
+def _build_api_agent() -> Any:
+    from agent import build_agent
+
+    cfg = get_llm_config()
+    return build_agent(
+        provider=cfg["provider"],
+        model=cfg["model"],
+        base_url=cfg["base_url"],
+        **_api_tool_config(),
+    )
+
+
+def _build_sql_agent() -> Any:
+    from sql_agent import build_sql_agent
+
+    cfg = get_llm_config()
+    db_path = os.getenv(
+        "SMASH_DB_PATH",
+        "/home/ozdotdotdot/code-repos/smashDA/.cache/startgg/smash.db",
+    )
+    return build_sql_agent(
+        provider=cfg["provider"],
+        model=cfg["model"],
+        base_url=cfg["base_url"],
+        db_path=db_path,
+    )
+
+
+def get_agent(mode: str) -> Any:
+    """Return the shared agent for ``mode``, building it on first use.
+
+    Agent modules are imported lazily so a disabled mode never pays for its
+    imports or construction. Sharing comes from the builders' own caches, so
+    the SQL agent is rebuilt for new sessions once smash.db is replaced.
+    """
+    if mode == "api":
+        return _build_api_agent()
+    if mode == "sql":
+        return _build_sql_agent()
+    raise ValueError(f"Unknown agent mode '{mode}'. Supported modes: {', '.join(AGENT_MODES)}.")
+
+
+def get_speculative_tools(mode: str) -> dict[str, Any]:
+    """Return the tools of ``mode``'s agent that may be prefetched during generation."""
+    if mode != "api":
+        return {}
+    from agent import build_agent_tools
+    from tools import speculative_tools
+
+    return speculative_tools(list(build_agent_tools(**_api_tool_config())))
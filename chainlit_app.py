@@ -2,68 +2,102 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import logging
 import os
-from typing import Any
+from typing import Any, Callable
 
 import chainlit as cl
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import BaseMessage, HumanMessage
 
-from agent import build_agent
-from sql_agent import build_sql_agent
+from agent_registry import enabled_modes, get_agent, get_llm_config, get_speculative_tools
+from llm_provider import warm_up_llm
+from speculation import ToolCallSpeculator
 
+LOGGER = logging.getLogger("smash_chainlit")
+_BACKGROUND_TASKS: set[asyncio.Task] = set()
 
-def _get_llm_config() -> dict:
-    """Return provider, model, and base_url from environment."""
-    provider = os.getenv("LLM_PROVIDER", "ollama")
+
+HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", "4096"))
+
+
+@functools.lru_cache(maxsize=4)
+def _token_counter(provider: str, model: str) -> Callable[[str], int]:
+    """Return a token counter for the model; char/4 estimate when no tokenizer is known."""
     if provider == "openai":
-        model = os.getenv("OPENAI_MODEL", "gpt-5.2")
-    else:
-        model = os.getenv("OLLAMA_MODEL", "qwen3:14b")
-    base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-    return {"provider": provider, "model": model, "base_url": base_url}
-
-
-def _build_api_agent() -> Any:
-    cfg = _get_llm_config()
-    api_base_url = os.getenv("SMASH_API_BASE_URL", "https://server.cetacean-tuna.ts.net")
-    include_high_intensity = os.getenv("DISABLE_HIGH_INTENSITY", "false").lower() not in {
-        "1",
-        "true",
-        "yes",
-    }
-    return build_agent(
-        provider=cfg["provider"],
-        model=cfg["model"],
-        base_url=cfg["base_url"],
-        api_base_url=api_base_url,
-        include_high_intensity=include_high_intensity,
+        try:
+            import tiktoken
+
+            encoding = tiktoken.encoding_for_model(model)
+        except (ImportError, KeyError):
+            pass
+        else:
+            return lambda text: len(encoding.encode(text))
+    return lambda text: len(text) // 4 + 1
+
+
+def trim_history(messages: list[BaseMessage], max_tokens: int = HISTORY_TOKEN_BUDGET) -> list[BaseMessage]:
+    """Keep the latest user turn, plus as many earlier turns as fit in ``max_tokens``.
+
+    The latest turn is kept whole even if it alone exceeds the budget (e.g. a
+    large tool result), so a follow-up question never loses its context.
+    """
+    latest = next(
+        (idx for idx in range(len(messages) - 1, -1, -1) if isinstance(messages[idx], HumanMessage)),
+        None,
     )
+    if latest is None:
+        return []
+    cfg = get_llm_config()
+    count_tokens = _token_counter(cfg["provider"], cfg["model"])
+    used = sum(count_tokens(str(message.content)) for message in messages[latest:])
+    start = latest
+    for idx in range(latest - 1, -1, -1):
+        used += count_tokens(str(messages[idx].content))
+        if used > max_tokens:
+            break
+        start = idx
+    # Never start on a tool result or tool-calling AI turn without its request.
+    while not isinstance(messages[start], HumanMessage):
+        start += 1
+    return messages[start:]
+
+
+_MODE_ACTIONS = {
+    "api": (
+        "API Agent (rankings & analytics)",
+        "- **API Agent** — rankings, tournament lookups, player analytics via the Smash API",
+    ),
+    "sql": (
+        "SQL Agent (query database directly)",
+        "- **SQL Agent** — ask natural language questions answered with SQL against the local database",
+    ),
+}
 
 
-def _build_sql_agent() -> Any:
-    cfg = _get_llm_config()
-    db_path = os.getenv(
-        "SMASH_DB_PATH",
-        "/home/ozdotdotdot/code-repos/smashDA/.cache/startgg/smash.db",
-    )
-    return build_sql_agent(
-        provider=cfg["provider"],
-        model=cfg["model"],
-        base_url=cfg["base_url"],
-        db_path=db_path,
-    )
+async def _warm_up_model() -> None:
+    cfg = get_llm_config()
+    try:
+        await warm_up_llm(cfg["provider"], cfg["model"], base_url=cfg["base_url"])
+    except Exception as exc:  # noqa: BLE001
+        LOGGER.warning("LLM warmup failed: %s", exc)
 
 
 @cl.on_chat_start
 async def on_chat_start() -> None:
+    # Load the model in the background while the user picks an agent mode.
+    task = asyncio.create_task(_warm_up_model())
+    _BACKGROUND_TASKS.add(task)
+    task.add_done_callback(_BACKGROUND_TASKS.discard)
+
+    modes = enabled_modes()
     actions = [
-        cl.Action(name="api_agent", payload={"mode": "api"}, label="API Agent (rankings & analytics)"),
-        cl.Action(name="sql_agent", payload={"mode": "sql"}, label="SQL Agent (query database directly)"),
+        cl.Action(name=f"{mode}_agent", payload={"mode": mode}, label=_MODE_ACTIONS[mode][0])
+        for mode in modes
     ]
     await cl.Message(
-        content="**Choose an agent mode:**\n"
-        "- **API Agent** — rankings, tournament lookups, player analytics via the Smash API\n"
-        "- **SQL Agent** — ask natural language questions answered with SQL against the local database",
+        content="**Choose an agent mode:**\n" + "\n".join(_MODE_ACTIONS[mode][1] for mode in modes),
         actions=actions,
     ).send()
 
@@ -71,8 +105,9 @@ async def on_chat_start() -> None:
 @cl.action_callback("api_agent")
 async def on_api_agent(action: cl.Action) -> None:
     await cl.Message(content="Building API agent...").send()
-    agent = _build_api_agent()
+    agent = get_agent("api")
     cl.user_session.set("agent", agent)
+    cl.user_session.set("speculative_tools", get_speculative_tools("api"))
     cl.user_session.set("history", [])
     await cl.Message(
         content="API agent is ready.\n"
@@ -83,8 +118,9 @@ async def on_api_agent(action: cl.Action) -> None:
 @cl.action_callback("sql_agent")
 async def on_sql_agent(action: cl.Action) -> None:
     await cl.Message(content="Building SQL agent (connecting to database)...").send()
-    agent = _build_sql_agent()
+    agent = get_agent("sql")
     cl.user_session.set("agent", agent)
+    cl.user_session.set("speculative_tools", get_speculative_tools("sql"))
     cl.user_session.set("history", [])
     await cl.Message(
         content="SQL agent is ready.\n"
@@ -105,14 +141,32 @@ async def on_message(message: cl.Message) -> None:
     history = cl.user_session.get("history") or []
 
     history.append(HumanMessage(content=message.content))
+    reply = cl.Message(content="")
+    speculator = ToolCallSpeculator(cl.user_session.get("speculative_tools") or {})
     try:
-        result = await cl.make_async(agent.invoke)(
+        messages: list[Any] = []
+        async for event in agent.astream_events(
             {"messages": history},
             config={"recursion_limit": 50},
-        )
-        messages = result.get("messages", [])
-        cl.user_session.set("history", messages[-40:])
-        content = messages[-1].content if messages else "No response from agent."
-        await cl.Message(content=content).send()
+            version="v2",
+        ):
+            kind = event["event"]
+            if kind == "on_chat_model_stream":
+                chunk = event["data"]["chunk"]
+                speculator.observe(event["run_id"], chunk)
+                token = chunk.content
+                if isinstance(token, str) and token:
+                    await reply.stream_token(token)
+            elif kind == "on_chat_model_end":
+                speculator.reconcile(event["run_id"], event["data"]["output"])
+            elif kind == "on_chain_end" and not event.get("parent_ids"):
+                messages = event["data"]["output"].get("messages", [])
+        cl.user_session.set("history", trim_history(messages))
+        # Tokens from intermediate tool-calling turns were streamed too; the
+        # final message replaces them with the answer itself.
+        reply.content = messages[-1].content if messages else "No response from agent."
+        await reply.send()
     except Exception as exc:  # noqa: BLE001
         await cl.Message(content=f"Agent error: {exc}").send()
+    finally:
+        speculator.cancel_pending()
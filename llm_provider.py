@@ -2,10 +2,21 @@
 
 from __future__ import annotations
 
+import functools
 import os
 from typing import Any
 
+# Stable routing key so OpenAI reuses the cached system prompt + tool schema prefix.
+OPENAI_PROMPT_CACHE_KEY = "smash-agent-v1"
+# Keep the Ollama model (and its KV state) resident between calls.
+OLLAMA_KEEP_ALIVE = "1h"
+# Pinned so every request loads the model with the same context size (a change forces a reload).
+OLLAMA_NUM_CTX = 8192
 
+_WARMED_UP: set[tuple[str, str | None, str]] = set()
+
+
+@functools.lru_cache(maxsize=8)
 def build_llm(
     provider: str = "ollama",
     model: str | None = None,
@@ -22,6 +33,9 @@ def build_llm(
         Model name/tag.  Defaults to provider-specific default.
     base_url : str
         Ollama server URL (ignored for openai).
+
+    Clients are cached per (provider, model, base_url), so repeated calls
+    return the same instance.
     """
     if provider == "openai":
         from langchain_openai import ChatOpenAI
@@ -30,7 +44,12 @@ def build_llm(
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable is required when using the openai provider")
-        return ChatOpenAI(model=model, temperature=0.1, api_key=api_key)
+        return ChatOpenAI(
+            model=model,
+            temperature=0.1,
+            api_key=api_key,
+            extra_body={"prompt_cache_key": OPENAI_PROMPT_CACHE_KEY},
+        )
 
     # Default: Ollama
     try:
@@ -39,4 +58,35 @@ def build_llm(
         from langchain_community.chat_models import ChatOllama
 
     model = model or "qwen3:14b"
-    return ChatOllama(model=model, base_url=base_url, temperature=0.1)
+    return ChatOllama(
+        model=model,
+        base_url=base_url,
+        temperature=0.1,
+        num_ctx=OLLAMA_NUM_CTX,
+        keep_alive=OLLAMA_KEEP_ALIVE,
+    )
+
+
+async def warm_up_llm(
+    provider: str = "ollama",
+    model: str | None = None,
+    *,
+    base_url: str = "http://localhost:11434",
+) -> None:
+    """Load the Ollama model before the first user message needs it.
+
+    Runs at most once per (provider, model, base_url); hosted providers are
+    skipped since they have no local model to load.
+    """
+    key = (provider, model, base_url)
+    if provider != "ollama" or key in _WARMED_UP:
+        return
+    _WARMED_UP.add(key)
+
+    from langchain_core.messages import HumanMessage
+
+    llm = build_llm(provider, model, base_url=base_url)
+    await llm.ainvoke(
+        [HumanMessage(content="warmup")],
+        options={"num_ctx": OLLAMA_NUM_CTX, "num_predict": 1},
+    )
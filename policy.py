@@ -3,21 +3,45 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-import re
 
+try:
+    import re2 as re  # google-re2: linear-time matching, same compile/search API.
+except ImportError:
+    import re
 
+    RE2_AVAILABLE = False
+else:
+    RE2_AVAILABLE = True
+
+
+# Lowercase pattern; inputs are lowercased once instead of matching with IGNORECASE.
 ANALYTICS_INTENT_RE = re.compile(
-    r"\b(stats?|analytics|performance|performed|who\s+did\s+best|player\s+metrics?)\b",
-    flags=re.IGNORECASE,
+    r"\b(stats?|analytics|performance|performed|who\s+did\s+best|player\s+metrics?)\b"
 )
 
 
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _has_unicode_boundaries(text: str, start: int, end: int) -> bool:
+    # RE2's \b only knows ASCII word characters, so "éstats" matches there but not in stdlib re.
+    return not (start > 0 and _is_word_char(text[start - 1])) and not (
+        end < len(text) and _is_word_char(text[end])
+    )
+
+
 @dataclass
 class ToolPolicy:
     """Small policy layer to keep high-intensity calls intentional."""
 
     def should_allow_high_intensity(self, user_request: str) -> bool:
-        return bool(ANALYTICS_INTENT_RE.search(user_request))
+        text = user_request.lower()
+        if not RE2_AVAILABLE:
+            return bool(ANALYTICS_INTENT_RE.search(text))
+        return any(
+            _has_unicode_boundaries(text, match.start(), match.end()) for match in ANALYTICS_INTENT_RE.finditer(text)
+        )
 
     def summarize_tournament_resolution(self, count: int) -> str | None:
         if count == 0:
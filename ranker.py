@@ -2,13 +2,34 @@
 
 from __future__ import annotations
 
-from typing import Any
+import heapq
+from typing import Any, Iterable, NamedTuple
+
+import numpy as np
 
 from ranking_profiles import RankingProfile
 
+__all__ = ["rank_players"]
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy path below is the fallback.
+    njit = None
+
 _NEUTRAL_SCORE = 0.5
 _MAX_CANDIDATES = 500
 _OVERSIZE_THRESHOLD = 5000
+# Reported scores are rounded to 6 decimals; rows within this slack of the
+# top-N cutoff may still tie with it after rounding.
+_ROUNDING_SLACK = 1e-6
+# fastmath without "nnan"/"ninf": missing metrics are encoded as NaN.
+_KERNEL_FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+
+class _ScoredPlayer(NamedTuple):
+    row: dict[str, Any]
+    ranking_score: float
+    score_contributions: dict[str, float]
 
 
 def _format_num(value: Any, decimals: int = 3) -> str:
@@ -28,28 +49,95 @@ def _seed_delta_label(value: Any) -> str:
     return "met_seed"
 
 
-def _normalize(
-    value: float | int | None,
-    *,
-    min_value: float,
-    max_value: float,
-    direction: str,
-) -> float:
-    if value is None:
-        return _NEUTRAL_SCORE
-    if max_value <= min_value:
-        return _NEUTRAL_SCORE
-    score = (float(value) - min_value) / (max_value - min_value)
-    if direction == "asc":
-        return 1.0 - score
-    return score
+def _metric_matrix(rows: list[dict[str, Any]], metrics: tuple[str, ...]) -> np.ndarray:
+    values = np.full((len(rows), len(metrics)), np.nan, dtype=np.float64)
+    for idx, row in enumerate(rows):
+        values[idx] = [row.get(metric) for metric in metrics]
+    return values
+
+
+def _metric_bounds_vectorized(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    present = ~np.isnan(values)
+    min_values = np.min(values, axis=0, initial=np.inf, where=present)
+    max_values = np.max(values, axis=0, initial=-np.inf, where=present)
+    unseen = ~present.any(axis=0)
+    min_values[unseen] = 0.0
+    max_values[unseen] = 1.0
+    return min_values, max_values
+
+
+def _metric_bounds_rows(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    rows, cols = values.shape
+    min_values = np.full(cols, np.inf)
+    max_values = np.full(cols, -np.inf)
+    seen = np.zeros(cols, dtype=np.bool_)
+    for i in range(rows):
+        for k in range(cols):
+            value = values[i, k]
+            if np.isnan(value):
+                continue
+            if value < min_values[k]:
+                min_values[k] = value
+            if value > max_values[k]:
+                max_values[k] = value
+            seen[k] = True
+    for k in range(cols):
+        if not seen[k]:
+            min_values[k] = 0.0
+            max_values[k] = 1.0
+    return min_values, max_values
 
 
-def _metric_bounds(rows: list[dict[str, Any]], metric: str) -> tuple[float, float]:
-    values = [float(row[metric]) for row in rows if row.get(metric) is not None]
-    if not values:
-        return (0.0, 1.0)
-    return (min(values), max(values))
+def _score_vectorized(
+    values: np.ndarray,
+    weights: np.ndarray,
+    bias: np.ndarray,
+    sign: np.ndarray,
+    min_values: np.ndarray,
+    max_values: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    spread = max_values - min_values
+    flat = ~(spread > 0)
+
+    normalized = bias + sign * ((values - min_values) / np.where(flat, 1.0, spread))
+    normalized[:, flat] = _NEUTRAL_SCORE
+    np.nan_to_num(normalized, copy=False, nan=_NEUTRAL_SCORE)
+    return normalized @ weights, normalized * weights
+
+
+def _score_rows(
+    values: np.ndarray,
+    weights: np.ndarray,
+    bias: np.ndarray,
+    sign: np.ndarray,
+    min_values: np.ndarray,
+    max_values: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    rows, cols = values.shape
+    scores = np.zeros(rows)
+    contributions = np.empty((rows, cols))
+    for i in range(rows):
+        total = 0.0
+        for k in range(cols):
+            value = values[i, k]
+            if np.isnan(value) or max_values[k] <= min_values[k]:
+                normalized = _NEUTRAL_SCORE
+            else:
+                raw = (value - min_values[k]) / (max_values[k] - min_values[k])
+                normalized = bias[k] + sign[k] * raw
+            weighted = normalized * weights[k]
+            contributions[i, k] = weighted
+            total += weighted
+        scores[i] = total
+    return scores, contributions
+
+
+if njit is not None:
+    _metric_bounds = njit(cache=True, fastmath=_KERNEL_FASTMATH)(_metric_bounds_rows)
+    _score_kernel = njit(cache=True, fastmath=_KERNEL_FASTMATH)(_score_rows)
+else:
+    _metric_bounds = _metric_bounds_vectorized
+    _score_kernel = _score_vectorized
 
 
 def _tiebreak_key(row: dict[str, Any]) -> tuple[float, float, float]:
@@ -63,17 +151,29 @@ def _tiebreak_key(row: dict[str, Any]) -> tuple[float, float, float]:
 def _reduce_oversized_pool(rows: list[dict[str, Any]]) -> tuple[list[dict[str, Any]], str | None]:
     if len(rows) <= _OVERSIZE_THRESHOLD:
         return rows, None
-    ranked = sorted(rows, key=_tiebreak_key, reverse=True)
-    return ranked[:_MAX_CANDIDATES], (
+    return heapq.nlargest(_MAX_CANDIDATES, rows, key=_tiebreak_key), (
         f"Candidate pool reduced from {len(rows)} to {_MAX_CANDIDATES} "
         "for deterministic scoring stability."
     )
 
 
+def _top_indices(scores: np.ndarray, rows: list[dict[str, Any]], top_n: int) -> list[int]:
+    count = len(scores)
+    if count > top_n:
+        cutoff = np.partition(scores, count - top_n)[count - top_n]
+        pool = np.flatnonzero(scores >= cutoff - _ROUNDING_SLACK).tolist()
+    else:
+        pool = range(count)
+    return heapq.nlargest(
+        top_n,
+        pool,
+        key=lambda idx: (round(float(scores[idx]), 6), *_tiebreak_key(rows[idx])),
+    )
+
+
 def _reason_lines(row: dict[str, Any], profile: RankingProfile) -> list[str]:
     reasons: list[str] = []
-    for metric_weight in profile.weights[:3]:
-        metric = metric_weight.metric
+    for metric in profile.reason_metrics:
         value = row.get(metric)
         if metric == "avg_seed_delta":
             label = _seed_delta_label(value)
@@ -93,37 +193,31 @@ def _reason_lines(row: dict[str, Any], profile: RankingProfile) -> list[str]:
 
 
 def rank_players(
-    rows: list[dict[str, Any]],
+    rows: Iterable[dict[str, Any]],
     *,
     profile: RankingProfile,
     top_n: int = 5,
 ) -> dict[str, Any]:
+    if not isinstance(rows, list):
+        rows = list(rows)
     candidates, reduction_note = _reduce_oversized_pool(rows)
-    bounds = {weight.metric: _metric_bounds(candidates, weight.metric) for weight in profile.weights}
-
-    scored_rows: list[dict[str, Any]] = []
-    for row in candidates:
-        score = 0.0
-        contributions: dict[str, float] = {}
-        for metric_weight in profile.weights:
-            min_value, max_value = bounds[metric_weight.metric]
-            normalized = _normalize(
-                row.get(metric_weight.metric),
-                min_value=min_value,
-                max_value=max_value,
-                direction=metric_weight.direction,
-            )
-            weighted = normalized * metric_weight.weight
-            score += weighted
-            contributions[metric_weight.metric] = round(weighted, 6)
+    metrics, weights, bias, sign = profile.compiled
 
-        next_row = dict(row)
-        next_row["ranking_score"] = round(score, 6)
-        next_row["score_contributions"] = contributions
-        scored_rows.append(next_row)
+    values = _metric_matrix(candidates, metrics)
+    min_values, max_values = _metric_bounds(values)
+    scores, contributions = _score_kernel(values, weights, bias, sign, min_values, max_values)
 
-    scored_rows.sort(key=lambda row: (row["ranking_score"], *_tiebreak_key(row)), reverse=True)
-    top_players = scored_rows[: max(1, top_n)]
+    top_players = [
+        _ScoredPlayer(
+            row=candidates[idx],
+            ranking_score=round(float(scores[idx]), 6),
+            score_contributions={
+                metric: round(float(weighted), 6)
+                for metric, weighted in zip(metrics, contributions[idx])
+            },
+        )
+        for idx in _top_indices(scores, candidates, max(1, top_n))
+    ]
 
     return {
         "intent": profile.intent,
@@ -153,19 +247,19 @@ def rank_players(
         "top_players": [
             {
                 "rank": idx + 1,
-                "gamer_tag": player.get("gamer_tag"),
-                "player_id": player.get("player_id"),
-                "ranking_score": player.get("ranking_score"),
-                "why": _reason_lines(player, profile),
+                "gamer_tag": player.row.get("gamer_tag"),
+                "player_id": player.row.get("player_id"),
+                "ranking_score": player.ranking_score,
+                "why": _reason_lines(player.row, profile),
                 "metrics": {
-                    "weighted_win_rate": player.get("weighted_win_rate"),
-                    "opponent_strength": player.get("opponent_strength"),
-                    "avg_seed_delta": player.get("avg_seed_delta"),
-                    "seed_delta_label": _seed_delta_label(player.get("avg_seed_delta")),
-                    "upset_rate": player.get("upset_rate"),
-                    "activity_score": player.get("activity_score"),
-                    "avg_event_entrants": player.get("avg_event_entrants"),
-                    "large_event_share": player.get("large_event_share"),
+                    "weighted_win_rate": player.row.get("weighted_win_rate"),
+                    "opponent_strength": player.row.get("opponent_strength"),
+                    "avg_seed_delta": player.row.get("avg_seed_delta"),
+                    "seed_delta_label": _seed_delta_label(player.row.get("avg_seed_delta")),
+                    "upset_rate": player.row.get("upset_rate"),
+                    "activity_score": player.row.get("activity_score"),
+                    "avg_event_entrants": player.row.get("avg_event_entrants"),
+                    "large_event_share": player.row.get("large_event_share"),
                 },
             }
             for idx, player in enumerate(top_players)
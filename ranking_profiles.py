@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Literal
 
+import numpy as np
+
 RankingIntent = Literal[
     "strongest",
     "clutch",
@@ -30,6 +33,24 @@ class RankingProfile:
     description: str
     weights: tuple[MetricWeight, ...]
 
+    @cached_property
+    def compiled(self) -> tuple[tuple[str, ...], np.ndarray, np.ndarray, np.ndarray]:
+        """Return ``(metrics, weights, bias, sign)`` as parallel arrays for the scorer.
+
+        Direction is encoded so that ``bias + sign * raw`` flips ``asc`` metrics
+        without a branch.
+        """
+        metrics = tuple(weight.metric for weight in self.weights)
+        weights = np.fromiter((weight.weight for weight in self.weights), dtype=np.float64)
+        bias = np.fromiter((weight.direction == "asc" for weight in self.weights), dtype=np.float64)
+        sign = 1.0 - 2.0 * bias
+        return metrics, weights, bias, sign
+
+    @cached_property
+    def reason_metrics(self) -> tuple[str, ...]:
+        """Names of the three highest-priority metrics quoted in ranking explanations."""
+        return tuple(weight.metric for weight in self.weights[:3])
+
 
 RANKING_PROFILES: dict[RankingIntent, RankingProfile] = {
     "strongest": RankingProfile(
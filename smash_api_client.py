@@ -2,13 +2,43 @@
 
 from __future__ import annotations
 
+from abc import ABC, abstractmethod
+import asyncio
 from dataclasses import dataclass
 import logging
+import random
+import threading
 import time
-from typing import Any
+from typing import Any, Iterator
 
+import orjson
 import requests
 from requests import RequestException
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3HTTPError, ReadTimeoutError
+from urllib3.util import Retry
+
+try:
+    import httpx
+except ImportError:  # Optional: only AsyncSmashAPIClient needs it.
+    httpx = None
+
+try:
+    import h2  # noqa: F401  (httpx's HTTP/2 backend)
+except ImportError:  # Optional: AsyncSmashAPIClient falls back to HTTP/1.1.
+    HTTP2_AVAILABLE = False
+else:
+    HTTP2_AVAILABLE = True
+
+try:
+    import ijson
+except ImportError:  # Optional: iter_precomputed falls back to parsing the whole body.
+    ijson = None
+
+try:
+    import requests_cache
+except ImportError:  # Optional: responses are only cached in memory by tools.py.
+    requests_cache = None
 
 
 class SmashAPIError(RuntimeError):
@@ -19,48 +49,131 @@ class SmashAPIError(RuntimeError):
         self.status_code = status_code
 
 
+class MissingResultsError(SmashAPIError):
+    """Raised when a ``/precomputed`` response has no list ``results`` field."""
+
+
 LOGGER = logging.getLogger("smash_api.client")
 
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 1.0
+RETRY_BACKOFF_JITTER = 0.5
+MAX_RETRY_AFTER_SECONDS = 30.0
 
-@dataclass
-class SmashAPIClient:
-    base_url: str = "https://server.cetacean-tuna.ts.net"
-    timeout_seconds: int = 30
+DEFAULT_BASE_URL = "https://server.cetacean-tuna.ts.net"
 
-    def __post_init__(self) -> None:
-        self._session = requests.Session()
+ENDPOINT_PATHS = (
+    "/health",
+    "/precomputed",
+    "/precomputed_series",
+    "/tournaments",
+    "/tournaments/by-slug",
+    "/search/by-slug",
+)
 
-    def _get(self, path: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
-        url = f"{self.base_url.rstrip('/')}{path}"
-        started = time.perf_counter()
-        LOGGER.info("API request: GET %s params=%s", path, params or {})
-        try:
-            response = self._session.get(url, params=params, timeout=self.timeout_seconds)
-        except RequestException as exc:
-            elapsed_ms = int((time.perf_counter() - started) * 1000)
-            LOGGER.error("API network error: GET %s in %d ms error=%s", path, elapsed_ms, exc)
-            raise SmashAPIError(f"Network error for GET {path}: {exc}") from exc
+HTTP_CACHE_NAME = ".cache/smash_api"
+HTTP_CACHE_EXPIRE_SECONDS = 3600
+# Patterns match URL prefixes, so "*/precomputed" also covers /precomputed_series.
+HTTP_CACHE_URLS_EXPIRE_AFTER = {
+    "*/health": 0,
+    "*/precomputed": 3600,
+    "*/tournaments/by-slug": 86400,
+}
 
-        elapsed_ms = int((time.perf_counter() - started) * 1000)
-        LOGGER.info("API response: GET %s status=%d in %d ms", path, response.status_code, elapsed_ms)
 
-        if not response.ok:
-            message = f"HTTP {response.status_code} for GET {path}"
-            retry_after = response.headers.get("Retry-After")
-            if retry_after:
-                message = f"{message} (Retry-After: {retry_after}s)"
-            try:
-                body = response.json()
-            except ValueError:
-                body = response.text
-            raise SmashAPIError(f"{message}. Body: {body}", status_code=response.status_code)
+class _CappedRetry(Retry):
+    """Retry that waits ``max(backoff, Retry-After)`` (capped) and never resends after a read timeout.
+
+    Dropped keep-alive sockets (``ProtocolError``) still count as retryable
+    read errors; a read timeout means the server may still be working on a
+    heavy request, so it is raised instead of sent again.
+    """
+
+    def get_retry_after(self, response: Any) -> float | None:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, MAX_RETRY_AFTER_SECONDS)
+
+    def sleep_for_retry(self, response: Any) -> bool:
+        retry_after = self.get_retry_after(response)
+        if retry_after is None:
+            return False
+        time.sleep(max(retry_after, self.get_backoff_time()))
+        return True
 
+    def increment(
+        self,
+        method: str | None = None,
+        url: str | None = None,
+        response: Any = None,
+        error: Exception | None = None,
+        _pool: Any = None,
+        _stacktrace: Any = None,
+    ) -> Retry:
+        if isinstance(error, ReadTimeoutError):
+            raise error
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
+
+def _decode_response(path: str, response: Any, *, ok: bool) -> dict[str, Any]:
+    """Return the JSON body of a requests or httpx response, or raise SmashAPIError.
+
+    Bodies are parsed from raw bytes with orjson, skipping charset detection and the text decode.
+    """
+    if not ok:
+        message = f"HTTP {response.status_code} for GET {path}"
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            message = f"{message} (Retry-After: {retry_after}s)"
         try:
-            return response.json()
-        except ValueError as exc:
-            raise SmashAPIError(f"Invalid JSON from GET {path}: {response.text}") from exc
+            body = orjson.loads(response.content)
+        except ValueError:
+            body = response.text
+        raise SmashAPIError(f"{message}. Body: {body}", status_code=response.status_code)
+
+    try:
+        return orjson.loads(response.content)
+    except ValueError as exc:
+        raise SmashAPIError(f"Invalid JSON from GET {path}: {response.text}") from exc
+
+
+def _precomputed_params(
+    *,
+    state: str,
+    months_back: int = 3,
+    videogame_id: int = 1386,
+    limit: int = 0,
+    filter_state: str | None = None,
+    min_entrants: int | None = None,
+) -> dict[str, Any]:
+    # Shared by get_precomputed and iter_precomputed so both send the same query.
+    params = {
+        "state": state.upper(),
+        "months_back": months_back,
+        "videogame_id": videogame_id,
+        "limit": limit,
+    }
+    if filter_state:
+        params["filter_state"] = filter_state.upper()
+    if min_entrants is not None:
+        params["min_entrants"] = min_entrants
+    return params
 
-    def health(self) -> dict[str, Any]:
+
+class _SmashAPIEndpoints(ABC):
+    """Endpoint methods shared by the sync and async clients.
+
+    Each method returns ``self._get(...)`` as-is, so on ``AsyncSmashAPIClient``
+    it returns an awaitable.
+    """
+
+    @abstractmethod
+    def _get(self, path: str, params: dict[str, Any] | None = None) -> Any:
+        """Issue ``GET path`` and return the decoded JSON (or an awaitable of it)."""
+
+    def health(self) -> Any:
         return self._get("/health")
 
     def get_precomputed(
@@ -72,17 +185,15 @@ class SmashAPIClient:
         limit: int = 0,
         filter_state: str | None = None,
         min_entrants: int | None = None,
-    ) -> dict[str, Any]:
-        params = {
-            "state": state.upper(),
-            "months_back": months_back,
-            "videogame_id": videogame_id,
-            "limit": limit,
-        }
-        if filter_state:
-            params["filter_state"] = filter_state.upper()
-        if min_entrants is not None:
-            params["min_entrants"] = min_entrants
+    ) -> Any:
+        params = _precomputed_params(
+            state=state,
+            months_back=months_back,
+            videogame_id=videogame_id,
+            limit=limit,
+            filter_state=filter_state,
+            min_entrants=min_entrants,
+        )
         return self._get("/precomputed", params=params)
 
     def get_precomputed_series(
@@ -94,14 +205,14 @@ class SmashAPIClient:
         videogame_id: int = 1386,
         limit: int = 0,
         allow_multi: bool = True,
-    ) -> dict[str, Any]:
+    ) -> Any:
         params = {
             "state": state.upper(),
             "tournament_contains": tournament_contains,
             "months_back": months_back,
             "videogame_id": videogame_id,
             "limit": limit,
-            "allow_multi": str(allow_multi).lower(),
+            "allow_multi": "true" if allow_multi else "false",
         }
         return self._get("/precomputed_series", params=params)
 
@@ -113,7 +224,7 @@ class SmashAPIClient:
         months_back: int = 3,
         videogame_id: int = 1386,
         limit: int = 0,
-    ) -> dict[str, Any]:
+    ) -> Any:
         params = {
             "state": state.upper(),
             "tournament_contains": tournament_contains,
@@ -123,7 +234,7 @@ class SmashAPIClient:
         }
         return self._get("/tournaments", params=params)
 
-    def lookup_tournament_by_slug(self, *, tournament_slug: str) -> dict[str, Any]:
+    def lookup_tournament_by_slug(self, *, tournament_slug: str) -> Any:
         return self._get("/tournaments/by-slug", params={"tournament_slug": tournament_slug})
 
     def search_by_slug(
@@ -132,10 +243,285 @@ class SmashAPIClient:
         tournament_slug: str,
         videogame_id: int = 1386,
         limit: int = 0,
-    ) -> dict[str, Any]:
+    ) -> Any:
         params = {
             "tournament_slug": tournament_slug,
             "videogame_id": videogame_id,
             "limit": limit,
         }
         return self._get("/search/by-slug", params=params)
+
+
+@dataclass
+class SmashAPIClient(_SmashAPIEndpoints):
+    """Blocking client with a pooled keep-alive session.
+
+    Meant to be long-lived and shared: obtain it with ``get_client(base_url)``
+    or ``SmashAPIClient.get_default()`` and pass that instance to
+    ``tools.build_tools`` rather than constructing one per request.
+    """
+
+    base_url: str = DEFAULT_BASE_URL
+    timeout_seconds: int = 30
+    http_cache: bool = True
+
+    def __post_init__(self) -> None:
+        # One keep-alive pool per client so repeated tool calls reuse TCP+TLS connections.
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            pool_block=False,
+            max_retries=_CappedRetry(
+                total=RETRY_TOTAL,
+                backoff_factor=RETRY_BACKOFF_FACTOR,
+                backoff_jitter=RETRY_BACKOFF_JITTER,
+                status_forcelist=RETRY_STATUS_CODES,
+                allowed_methods=("GET",),
+                respect_retry_after_header=True,
+                # Hand the final error response to _get so it reports status and Retry-After.
+                raise_on_status=False,
+            ),
+        )
+        if self.http_cache and requests_cache is not None:
+            # On-disk GET cache keyed by URL + sorted params; serves repeat questions without a round trip.
+            self._session = requests_cache.CachedSession(
+                cache_name=HTTP_CACHE_NAME,
+                backend="sqlite",
+                expire_after=HTTP_CACHE_EXPIRE_SECONDS,
+                urls_expire_after=HTTP_CACHE_URLS_EXPIRE_AFTER,
+                allowable_methods=("GET",),
+                stale_if_error=True,
+            )
+        else:
+            self._session = requests.Session()
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        # Full URLs are built once; _get only does a dict lookup per call.
+        self._base_url = self.base_url.rstrip("/")
+        self._urls = {path: f"{self._base_url}{path}" for path in ENDPOINT_PATHS}
+        self._session.headers.update(
+            {
+                "Connection": "keep-alive",
+                "Accept": "application/json",
+                "User-Agent": "smash-rag/1.0",
+            }
+        )
+
+    @classmethod
+    def get_default(cls) -> SmashAPIClient:
+        """Return the process-wide client for DEFAULT_BASE_URL."""
+        return get_client(DEFAULT_BASE_URL)
+
+    def close(self) -> None:
+        """Close pooled connections; the client can't be used afterwards.
+
+        Closing the shared instance also drops it from ``get_client``, so the
+        next call there builds a fresh client instead of returning this one.
+        """
+        _forget_shared(_CLIENTS, self)
+        self._session.close()
+
+    def __enter__(self) -> SmashAPIClient:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _get(self, path: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        url = self._urls.get(path) or f"{self._base_url}{path}"
+        started = time.perf_counter()
+        LOGGER.info("API request: GET %s params=%s", path, params or {})
+        try:
+            response = self._session.get(url, params=params, timeout=self.timeout_seconds)
+        except RequestException as exc:
+            elapsed_ms = int((time.perf_counter() - started) * 1000)
+            LOGGER.error("API network error: GET %s in %d ms error=%s", path, elapsed_ms, exc)
+            raise SmashAPIError(f"Network error for GET {path}: {exc}") from exc
+
+        elapsed_ms = int((time.perf_counter() - started) * 1000)
+        LOGGER.info("API response: GET %s status=%d in %d ms", path, response.status_code, elapsed_ms)
+
+        return _decode_response(path, response, ok=response.ok)
+
+    def iter_precomputed(
+        self,
+        *,
+        state: str,
+        months_back: int = 3,
+        videogame_id: int = 1386,
+        limit: int = 0,
+        filter_state: str | None = None,
+        min_entrants: int | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield ``/precomputed`` result rows as they are decoded from the response stream.
+
+        Takes the same arguments as ``get_precomputed``. Peak memory holds the
+        current row plus the rows already consumed, not the raw body and its
+        full object tree. Without ``ijson``, or with the requests-cache session,
+        this parses the whole body like ``get_precomputed``. Request errors
+        surface on iteration; a missing or non-list ``results`` raises
+        MissingResultsError.
+        """
+        params = _precomputed_params(
+            state=state,
+            months_back=months_back,
+            videogame_id=videogame_id,
+            limit=limit,
+            filter_state=filter_state,
+            min_entrants=min_entrants,
+        )
+        return self._iter_results("/precomputed", params)
+
+    def _iter_results(self, path: str, params: dict[str, Any]) -> Iterator[dict[str, Any]]:
+        # requests-cache buffers misses to store them and replays hits with an empty ``raw``,
+        # so a cached session gets the parsed body instead of a stream.
+        if ijson is None or (requests_cache is not None and isinstance(self._session, requests_cache.CachedSession)):
+            data = self._get(path, params=params)
+            rows = data.get("results") if isinstance(data, dict) else None
+            if not isinstance(rows, list):
+                raise MissingResultsError(f"GET {path} response missing list field 'results'.")
+            yield from rows
+            return
+
+        started = time.perf_counter()
+        LOGGER.info("API request: GET %s params=%s (streamed)", path, params)
+        try:
+            response = self._session.get(self._urls[path], params=params, timeout=self.timeout_seconds, stream=True)
+        except RequestException as exc:
+            elapsed_ms = int((time.perf_counter() - started) * 1000)
+            LOGGER.error("API network error: GET %s in %d ms error=%s", path, elapsed_ms, exc)
+            raise SmashAPIError(f"Network error for GET {path}: {exc}") from exc
+
+        results_event = None
+
+        def watch_results(events: Iterator[tuple[str, str, Any]]) -> Iterator[tuple[str, str, Any]]:
+            # Record what the top-level "results" value starts with; items() alone can't tell
+            # a missing or non-array field from an empty list.
+            nonlocal results_event
+            for prefix, event, value in events:
+                if results_event is None and prefix == "results":
+                    results_event = event
+                yield prefix, event, value
+
+        with response:
+            LOGGER.info("API response: GET %s status=%d (streaming)", path, response.status_code)
+            if not response.ok:
+                _decode_response(path, response, ok=False)
+            # Let urllib3 undo gzip/deflate so ijson sees plain JSON bytes.
+            response.raw.decode_content = True
+            count = 0
+            try:
+                events = watch_results(ijson.parse(response.raw, use_float=True))
+                for row in ijson.items(events, "results.item"):
+                    count += 1
+                    yield row
+            except (ijson.JSONError, Urllib3HTTPError, RequestException) as exc:
+                raise SmashAPIError(f"Invalid or truncated JSON stream from GET {path}: {exc}") from exc
+        if results_event != "start_array":
+            raise MissingResultsError(f"GET {path} response missing list field 'results'.")
+        elapsed_ms = int((time.perf_counter() - started) * 1000)
+        LOGGER.info("API stream done: GET %s rows=%d in %d ms", path, count, elapsed_ms)
+
+
+def _retry_delay(response: Any | None, attempt: int) -> float:
+    """Mirror _CappedRetry: jittered exponential backoff, or a longer numeric Retry-After up to the cap."""
+    backoff = RETRY_BACKOFF_FACTOR * (2**attempt) + random.uniform(0, RETRY_BACKOFF_JITTER)
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            return max(backoff, min(max(float(retry_after), 0.0), MAX_RETRY_AFTER_SECONDS))
+        except ValueError:
+            pass
+    return backoff
+
+
+@dataclass
+class AsyncSmashAPIClient(_SmashAPIEndpoints):
+    """``httpx.AsyncClient`` counterpart of SmashAPIClient; endpoint methods are awaitable.
+
+    Bound to the event loop it is first used on. Requires ``httpx``.
+    """
+
+    base_url: str = DEFAULT_BASE_URL
+    timeout_seconds: int = 30
+
+    def __post_init__(self) -> None:
+        if httpx is None:
+            raise RuntimeError("AsyncSmashAPIClient requires httpx. Install it with: pip install httpx")
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url.rstrip("/"),
+            timeout=self.timeout_seconds,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            # Concurrent tool calls multiplex over one TLS connection instead of opening one each.
+            http2=HTTP2_AVAILABLE,
+            headers={"Accept": "application/json", "User-Agent": "smash-rag/1.0"},
+        )
+
+    async def aclose(self) -> None:
+        """Close pooled connections; the client can't be used afterwards.
+
+        Like ``SmashAPIClient.close``, this drops the shared instance from
+        ``get_async_client``.
+        """
+        _forget_shared(_ASYNC_CLIENTS, self)
+        await self._client.aclose()
+
+    async def __aenter__(self) -> AsyncSmashAPIClient:
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def _get(self, path: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        started = time.perf_counter()
+        LOGGER.info("API request: GET %s params=%s", path, params or {})
+        for attempt in range(RETRY_TOTAL + 1):
+            try:
+                response = await self._client.get(path, params=params)
+            except httpx.TransportError as exc:
+                # Like _CappedRetry: retry dropped/reset connections, never a read timeout.
+                if attempt == RETRY_TOTAL or isinstance(exc, httpx.ReadTimeout):
+                    elapsed_ms = int((time.perf_counter() - started) * 1000)
+                    LOGGER.error("API network error: GET %s in %d ms error=%s", path, elapsed_ms, exc)
+                    raise SmashAPIError(f"Network error for GET {path}: {exc}") from exc
+                await asyncio.sleep(_retry_delay(None, attempt))
+                continue
+            if response.status_code not in RETRY_STATUS_CODES or attempt == RETRY_TOTAL:
+                break
+            await asyncio.sleep(_retry_delay(response, attempt))
+
+        elapsed_ms = int((time.perf_counter() - started) * 1000)
+        LOGGER.info("API response: GET %s status=%d in %d ms", path, response.status_code, elapsed_ms)
+        return _decode_response(path, response, ok=response.is_success)
+
+
+# Shared clients by base URL. A plain dict rather than lru_cache so close() can evict one.
+_CLIENTS: dict[str, SmashAPIClient] = {}
+_ASYNC_CLIENTS: dict[str, AsyncSmashAPIClient] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _forget_shared(clients: dict[str, Any], client: Any) -> None:
+    with _CLIENTS_LOCK:
+        if clients.get(client.base_url) is client:
+            del clients[client.base_url]
+
+
+def get_client(base_url: str) -> SmashAPIClient:
+    """Return the process-wide client for ``base_url`` so its connection pool is shared."""
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(base_url)
+        if client is None:
+            client = _CLIENTS[base_url] = SmashAPIClient(base_url=base_url)
+        return client
+
+
+def get_async_client(base_url: str) -> AsyncSmashAPIClient | None:
+    """Async counterpart of get_client; None when httpx isn't installed."""
+    if httpx is None:
+        return None
+    with _CLIENTS_LOCK:
+        client = _ASYNC_CLIENTS.get(base_url)
+        if client is None:
+            client = _ASYNC_CLIENTS[base_url] = AsyncSmashAPIClient(base_url=base_url)
+        return client
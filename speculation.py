@@ -0,0 +1,80 @@
+"""Speculative tool prefetch while the model is still generating."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Any
+
+LOGGER = logging.getLogger("smash_agent.speculation")
+
+
+def _call_key(name: str, args: dict[str, Any]) -> tuple[str, str]:
+    return name, json.dumps(args, sort_keys=True, default=str)
+
+
+async def _prefetch(tool: Any, args: dict[str, Any]) -> None:
+    try:
+        await tool.ainvoke(args)
+    except Exception as exc:  # noqa: BLE001
+        # Speculative only: the agent's own tool call reports real failures.
+        LOGGER.debug("Speculative %s call failed: %s", tool.name, exc)
+
+
+class ToolCallSpeculator:
+    """Start memoized tool calls as soon as their arguments finish streaming.
+
+    The model streams tool-call arguments as JSON fragments. Once a
+    fragment buffer parses as a complete object, the call is started in the
+    background; it fills the tool's result cache, so the agent's own call for
+    the same arguments (made after generation ends) is served from it.
+    Prefetches that the final message does not request are cancelled.
+    """
+
+    def __init__(self, tools: dict[str, Any]) -> None:
+        self._tools = tools
+        self._buffers: dict[tuple[str, Any], tuple[str, str]] = {}
+        self._tasks: dict[tuple[str, tuple[str, str]], asyncio.Task] = {}
+
+    def observe(self, run_id: str, chunk: Any) -> None:
+        """Feed one ``on_chat_model_stream`` chunk."""
+        if not self._tools:
+            return
+        for part in getattr(chunk, "tool_call_chunks", None) or []:
+            slot = (run_id, part["index"] if part.get("index") is not None else part.get("id"))
+            name, args_text = self._buffers.get(slot, ("", ""))
+            name = name or part.get("name") or ""
+            args_text += part.get("args") or ""
+            self._buffers[slot] = (name, args_text)
+            self._maybe_launch(run_id, name, args_text)
+
+    def _maybe_launch(self, run_id: str, name: str, args_text: str) -> None:
+        tool = self._tools.get(name)
+        if tool is None or not args_text:
+            return
+        try:
+            args = json.loads(args_text)
+        except ValueError:
+            return
+        if not isinstance(args, dict):
+            return
+        task_key = (run_id, _call_key(name, args))
+        if task_key not in self._tasks:
+            LOGGER.info("Speculatively starting %s args=%s", name, args)
+            self._tasks[task_key] = asyncio.create_task(_prefetch(tool, args))
+
+    def reconcile(self, run_id: str, message: Any) -> None:
+        """Cancel this run's prefetches that its finished message did not ask for."""
+        requested = {_call_key(call["name"], call["args"]) for call in getattr(message, "tool_calls", None) or []}
+        for task_key, task in list(self._tasks.items()):
+            task_run_id, call_key = task_key
+            if task_run_id == run_id and call_key not in requested:
+                task.cancel()
+                del self._tasks[task_key]
+
+    def cancel_pending(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+        self._buffers.clear()
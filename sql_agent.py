@@ -3,22 +3,26 @@
 from __future__ import annotations
 
 import argparse
-import json
+import functools
 import logging
+import os
 import sqlite3
+import string
+import threading
 import time
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from langchain_community.agent_toolkits import SQLDatabaseToolkit
-from langchain_community.utilities import SQLDatabase
-from langchain_core.messages import HumanMessage
-from langchain_core.tools import tool
-from langchain.agents import create_agent as create_react_agent
+import orjson
 
 from llm_provider import build_llm
 from ranker import rank_players as run_ranking
 from ranking_profiles import RANKING_PROFILES
 
+# LangChain imports are deferred to the functions that need them so `--help`
+# and importers that only use the ranking/index helpers don't load them.
+if TYPE_CHECKING:
+    from langchain_community.utilities import SQLDatabase
+
 LOGGER = logging.getLogger("smash_sql_agent")
 
 SQL_SYSTEM_PROMPT = """You are an agent designed to interact with a SQL database containing \
@@ -27,7 +31,7 @@ Super Smash Bros. Ultimate tournament and player data.
 Given an input question, create a syntactically correct SQLite query to run, \
 then look at the results of the query and return the answer.
 
-Unless the user specifies a specific number of results, always LIMIT your query to at most {top_k} results.
+Unless the user specifies a specific number of results, always LIMIT your query to at most $top_k results.
 
 You can order the results by a relevant column to return the most interesting examples in the database. \
 Never query for all the columns from a specific table — only ask for the relevant columns given the question.
@@ -78,10 +82,10 @@ Lightweight tables (prefer these):
 Heavy tables (use only when needed):
 - event_payloads: event_id (FK -> events.id), seeds_json, standings_json, sets_json — large JSON blobs.
   Use json_extract() / json_each() to query these.
-  standings_json: [{{"placement": N, "entrant": {{"id": N, "name": "Tag"}}}}]
-  sets_json: [{{"fullRoundText": "Grand Final", "winnerId": N, "slots": [{{"entrant": {{"id": N, "name": "Tag", \
-"participants": [{{"gamerTag": "...", "player": {{"id": N}}}}]}}, "standing": {{"placement": N, "stats": \
-{{"score": {{"value": N}}}}}}}}]}}]
+  standings_json: [{"placement": N, "entrant": {"id": N, "name": "Tag"}}]
+  sets_json: [{"fullRoundText": "Grand Final", "winnerId": N, "slots": [{"entrant": {"id": N, "name": "Tag", \
+"participants": [{"gamerTag": "...", "player": {"id": N}}]}, "standing": {"placement": N, "stats": \
+{"score": {"value": N}}}}]}]
 
 Tips:
 - Dates are Unix timestamps. Use datetime(start_at, 'unixepoch') for human-readable dates.
@@ -90,12 +94,124 @@ Tips:
 - For JSON array queries: SELECT value FROM event_payloads, json_each(event_payloads.standings_json) ...
 """
 
+# string.Template: "$top_k" is the only placeholder, so the JSON examples need no brace escaping.
+_SQL_PROMPT_TEMPLATE = string.Template(SQL_SYSTEM_PROMPT)
+
 DEFAULT_TOP_K = 10
 DEFAULT_DB_PATH = "/home/ozdotdotdot/code-repos/smashDA/.cache/startgg/smash.db"
 
 
+RANK_CACHE_MAXSIZE = 512
+RANK_CACHE_BUCKET_SECONDS = 3600
+_INTENT_SET = frozenset(RANKING_PROFILES)
+_SUPPORTED_INTENTS = ", ".join(sorted(RANKING_PROFILES))
+_RANK_COLUMNS = (
+    "player_id",
+    "gamer_tag",
+    "weighted_win_rate",
+    "opponent_strength",
+    "avg_seed_delta",
+    "upset_rate",
+    "activity_score",
+    "home_state",
+    "avg_event_entrants",
+    "max_event_entrants",
+    "large_event_share",
+    "latest_event_start",
+)
+_RANK_QUERY = f"""
+        SELECT {", ".join(_RANK_COLUMNS)}
+        FROM player_metrics
+        WHERE state = ?
+          AND videogame_id = 1386
+          AND months_back = ?
+          AND home_state = ?
+          AND avg_event_entrants >= ?
+    """
+_READONLY_PRAGMAS = (
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=1073741824",
+    "PRAGMA query_only=1",
+    "PRAGMA temp_store=MEMORY",
+)
+# Equality columns first, range column last, so the rank query is an index range scan.
+RANK_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS idx_pm_rank "
+    "ON player_metrics(state, videogame_id, months_back, home_state, avg_event_entrants)"
+)
+# sqlite3 connections aren't safe for concurrent use; tools may run on worker threads.
+_CONN_LOCK = threading.Lock()
+
+
+def ensure_rank_index(db_path: str) -> None:
+    """Create the player_metrics index used by rank_players_by_intent (needs write access)."""
+    conn = sqlite3.connect(db_path)
+    try:
+        started = time.perf_counter()
+        conn.execute(RANK_INDEX_SQL)
+        conn.commit()
+        LOGGER.info("Ensured idx_pm_rank on %s in %d ms", db_path, int((time.perf_counter() - started) * 1000))
+    finally:
+        conn.close()
+
+
+def _db_version(db_path: str) -> tuple[int, int]:
+    """Identify the current file at ``db_path``; changes when smash.db is rewritten or replaced."""
+    stat = os.stat(db_path)
+    return stat.st_ino, stat.st_mtime_ns
+
+
+@functools.lru_cache(maxsize=2)
+def _readonly_connection(db_path: str, db_version: tuple[int, int]) -> sqlite3.Connection:
+    """Return a long-lived read-only connection so the page cache stays warm across calls.
+
+    ``db_version`` keys it to one file version; a replaced database gets a new
+    connection and the old one is released once evicted from the cache.
+    """
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+    for pragma in _READONLY_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+@functools.lru_cache(maxsize=RANK_CACHE_MAXSIZE)
+def _rank_cached(
+    db_path: str,
+    state: str,
+    months_back: int,
+    intent: str,
+    top_n: int,
+    min_entrants: int,
+    db_version: tuple[int, int],
+    time_bucket: int,
+) -> str:
+    """Fetch and rank players; a new ``db_version`` or hourly ``time_bucket`` expires cached results."""
+    LOGGER.info("rank_players_by_intent SQL:\n%s", _RANK_QUERY)
+    LOGGER.info("  params: state=%s, months_back=%d, home_state=%s, min_entrants=%d",
+                state, months_back, state, min_entrants)
+    with _CONN_LOCK:
+        rows = _readonly_connection(db_path, db_version).execute(_RANK_QUERY, (state, months_back, state, min_entrants)).fetchall()
+
+    if not rows:
+        return orjson.dumps({"error": f"No players found for state={state} with min_entrants>={min_entrants}."}).decode()
+
+    # Plain tuples from the cursor; one zip per row instead of building sqlite3.Row objects first.
+    row_dicts = [dict(zip(_RANK_COLUMNS, row)) for row in rows]
+    ranked = run_ranking(row_dicts, profile=RANKING_PROFILES[intent], top_n=top_n)
+    ranked["query"] = {
+        "state": state,
+        "intent": intent,
+        "months_back": months_back,
+        "videogame_id": 1386,
+        "top_n": top_n,
+        "min_entrants": min_entrants,
+    }
+    return orjson.dumps(ranked, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+
 def _build_rank_tool(db_path: str):
     """Create the rank_players_by_intent tool with a closure over db_path."""
+    from langchain_core.tools import tool
 
     @tool
     def rank_players_by_intent(
@@ -109,52 +225,32 @@ def _build_rank_tool(db_path: str):
         'best players', 'most underrated', 'most clutch', etc. Intents: strongest,
         clutch, underrated, overrated, consistent, upset_heavy, activity_monsters.
         Returns ranked players with method transparency in JSON."""
-        if intent not in RANKING_PROFILES:
-            return (
-                f"Unsupported intent '{intent}'. "
-                f"Supported intents: {', '.join(sorted(RANKING_PROFILES.keys()))}."
-            )
-
-        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
-        conn.row_factory = sqlite3.Row
-        try:
-            query = """
-                SELECT player_id, gamer_tag, weighted_win_rate, opponent_strength,
-                       avg_seed_delta, upset_rate, activity_score, home_state,
-                       avg_event_entrants, max_event_entrants, large_event_share,
-                       latest_event_start
-                FROM player_metrics
-                WHERE state = ?
-                  AND videogame_id = 1386
-                  AND months_back = ?
-                  AND home_state = ?
-                  AND avg_event_entrants >= ?
-            """
-            LOGGER.info("rank_players_by_intent SQL:\n%s", query)
-            LOGGER.info("  params: state=%s, months_back=%d, home_state=%s, min_entrants=%d",
-                        state.upper(), months_back, state.upper(), min_entrants)
-            rows = conn.execute(query, (state.upper(), months_back, state.upper(), min_entrants)).fetchall()
-        finally:
-            conn.close()
-
-        if not rows:
-            return json.dumps({"error": f"No players found for state={state.upper()} with min_entrants>={min_entrants}."})
-
-        row_dicts = [dict(row) for row in rows]
-        ranked = run_ranking(row_dicts, profile=RANKING_PROFILES[intent], top_n=top_n)
-        ranked["query"] = {
-            "state": state.upper(),
-            "intent": intent,
-            "months_back": months_back,
-            "videogame_id": 1386,
-            "top_n": top_n,
-            "min_entrants": min_entrants,
-        }
-        return json.dumps(ranked, ensure_ascii=True)
+        if intent not in _INTENT_SET:
+            return f"Unsupported intent '{intent}'. Supported intents: {_SUPPORTED_INTENTS}."
+        return _rank_cached(
+            db_path,
+            state.upper(),
+            months_back,
+            intent,
+            top_n,
+            min_entrants,
+            _db_version(db_path),
+            int(time.time() // RANK_CACHE_BUCKET_SECONDS),
+        )
 
     return rank_players_by_intent
 
 
+@functools.lru_cache(maxsize=2)
+def _reflected_db(db_path: str, db_version: tuple[int, int], echo: bool = False) -> SQLDatabase:
+    """Reflect the schema once per database file version, shared by agents for different LLM configs."""
+    from langchain_community.utilities import SQLDatabase
+
+    # Read-only connection via SQLite URI; echo=True logs all SQL via sqlalchemy.engine
+    db_uri = f"sqlite:///file:{db_path}?mode=ro&uri=true"
+    return SQLDatabase.from_uri(db_uri, engine_args={"echo": echo})
+
+
 def build_sql_agent(
     *,
     provider: str = "ollama",
@@ -162,10 +258,35 @@ def build_sql_agent(
     base_url: str = "http://localhost:11434",
     db_path: str = DEFAULT_DB_PATH,
     top_k: int = DEFAULT_TOP_K,
+    sql_echo: bool = False,
 ) -> Any:
-    # Read-only connection via SQLite URI; echo=True logs all SQL via sqlalchemy.engine
-    db_uri = f"sqlite:///file:{db_path}?mode=ro&uri=true"
-    db = SQLDatabase.from_uri(db_uri, engine_args={"echo": True})
+    """Return the shared agent for this config; a replaced database file gets a freshly reflected one."""
+    return _build_sql_agent(
+        provider=provider,
+        model=model,
+        base_url=base_url,
+        db_path=db_path,
+        top_k=top_k,
+        sql_echo=sql_echo,
+        db_version=_db_version(db_path),
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _build_sql_agent(
+    *,
+    provider: str,
+    model: str | None,
+    base_url: str,
+    db_path: str,
+    top_k: int,
+    sql_echo: bool,
+    db_version: tuple[int, int],
+) -> Any:
+    from langchain.agents import create_agent as create_react_agent
+    from langchain_community.agent_toolkits import SQLDatabaseToolkit
+
+    db = _reflected_db(db_path, db_version, sql_echo)
 
     llm = build_llm(provider, model, base_url=base_url)
 
@@ -176,12 +297,14 @@ def build_sql_agent(
     all_tools = toolkit_tools + [rank_tool]
 
     llm_with_tools = llm.bind_tools(all_tools)
-    prompt = SQL_SYSTEM_PROMPT.format(top_k=top_k)
+    prompt = _SQL_PROMPT_TEMPLATE.substitute(top_k=top_k)
 
     return create_react_agent(llm_with_tools, all_tools, system_prompt=prompt)
 
 
 def run_query(agent: Any, query: str) -> dict[str, Any]:
+    from langchain_core.messages import HumanMessage
+
     started = time.perf_counter()
     result = agent.invoke(
         {"messages": [HumanMessage(content=query)]},
@@ -204,9 +327,25 @@ def main() -> None:
         help="Path to smash.db SQLite database.",
     )
     parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K, help="Default LIMIT for queries.")
+    parser.add_argument(
+        "--sql-echo",
+        action="store_true",
+        help="Log every SQL statement the agent runs (sqlalchemy.engine at INFO).",
+    )
+    parser.add_argument(
+        "--create-indexes",
+        action="store_true",
+        help="Create the player_metrics ranking index before running (opens the DB read-write once).",
+    )
     args = parser.parse_args()
 
     logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    if not args.sql_echo:
+        # SQLAlchemy logs statements whenever its logger is enabled for INFO, echo flag or not.
+        logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
+
+    if args.create_indexes:
+        ensure_rank_index(args.db_path)
 
     agent = build_sql_agent(
         provider=args.provider,
@@ -214,6 +353,7 @@ def main() -> None:
         base_url=args.base_url,
         db_path=args.db_path,
         top_k=args.top_k,
+        sql_echo=args.sql_echo,
     )
     result = run_query(agent, args.query)
     print(result["messages"][-1].content)
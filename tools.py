@@ -2,22 +2,174 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections import OrderedDict
+import functools
+import inspect
 import json
-from typing import Any
+import threading
+import time
+from typing import Any, Awaitable, Callable
 
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool
+import orjson
 
 from policy import ToolPolicy
 from ranker import rank_players as run_ranking
 from ranking_profiles import RANKING_PROFILES, RankingIntent
-from smash_api_client import SmashAPIClient, SmashAPIError
+from smash_api_client import AsyncSmashAPIClient, MissingResultsError, SmashAPIClient, SmashAPIError
 
 ULTIMATE_VIDEOGAME_ID = 1386
 FULL_RESULT_LIMIT = 0
+TOOL_CACHE_MAXSIZE = 1024
+RANKING_CACHE_TTL_SECONDS = 3600
+LOOKUP_CACHE_TTL_SECONDS = 300
+_INTENT_SET = frozenset(RANKING_PROFILES)
+_SUPPORTED_INTENTS = ", ".join(sorted(RANKING_PROFILES))
+_MISSING_RESULTS = "Error: /precomputed response missing list field 'results'."
 
 
 def _json(data: dict[str, Any]) -> str:
-    return json.dumps(data, ensure_ascii=True)
+    # orjson emits compact UTF-8 and is several times faster on full API payloads.
+    return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+
+class _TTLCache:
+    """Thread-safe LRU cache whose entries expire ``ttl_seconds`` after insertion.
+
+    Concurrent misses on the same key are coalesced: one caller computes while
+    the others wait for its result.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float) -> None:
+        self._maxsize = maxsize
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._in_flight: dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _store(self, key: str, value: str) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def _claim(self, key: str) -> tuple[str | None, threading.Event | None, bool]:
+        """Return (cached value, in-flight event, whether this caller owns the computation)."""
+        with self._lock:
+            value = self._lookup(key)
+            if value is not None:
+                return value, None, False
+            pending = self._in_flight.get(key)
+            if pending is not None:
+                return None, pending, False
+            pending = self._in_flight[key] = threading.Event()
+            return None, pending, True
+
+    def _finish(self, key: str, value: str | None, pending: threading.Event) -> None:
+        with self._lock:
+            # Tools report failures as "Error ..." strings; don't pin those for the TTL.
+            if value is not None and not value.startswith("Error"):
+                self._store(key, value)
+            del self._in_flight[key]
+        pending.set()
+
+    def get_or_compute(self, key: str, compute: Callable[[], str]) -> str:
+        while True:
+            value, pending, owner = self._claim(key)
+            if value is not None:
+                return value
+            if owner:
+                break
+            # Another caller is computing this key; if it didn't cache a result, retry ourselves.
+            pending.wait()
+
+        value = None
+        try:
+            value = compute()
+            return value
+        finally:
+            self._finish(key, value, pending)
+
+    async def aget_or_compute(self, key: str, compute: Callable[[], Awaitable[str]]) -> str:
+        while True:
+            value, pending, owner = self._claim(key)
+            if value is not None:
+                return value
+            if owner:
+                break
+            # The owner may be a worker thread running the sync path, so wait off the event loop.
+            await asyncio.to_thread(pending.wait)
+
+        value = None
+        try:
+            value = await compute()
+            return value
+        finally:
+            self._finish(key, value, pending)
+
+
+def _cached_tool(cache: _TTLCache) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Memoize a tool function on its canonicalized arguments (defaults applied).
+
+    Works on both plain and ``async`` functions; a tool's sync and async
+    implementations share one ``cache``.
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        signature = inspect.signature(func)
+
+        def cache_key(args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return json.dumps(bound.arguments, sort_keys=True, default=str)
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> str:
+                return await cache.aget_or_compute(cache_key(args, kwargs), lambda: func(*args, **kwargs))
+
+            async_wrapper.tool_cache = cache
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> str:
+            return cache.get_or_compute(cache_key(args, kwargs), lambda: func(*args, **kwargs))
+
+        wrapper.tool_cache = cache
+        return wrapper
+
+    return decorator
+
+
+def speculative_tools(tools: list[Any]) -> dict[str, Any]:
+    """Return the memoized tools by name; only these are safe to prefetch speculatively.
+
+    A prefetched call lands in the same cache the agent's own call reads, so
+    the result is reused. Policy-gated high-intensity tools are never memoized
+    and therefore never prefetched.
+    """
+    return {
+        tool_.name: tool_
+        for tool_ in tools
+        if hasattr(getattr(tool_, "func", None), "tool_cache")
+    }
+
+
+def _new_cache(ttl_seconds: float) -> _TTLCache:
+    return _TTLCache(TOOL_CACHE_MAXSIZE, ttl_seconds)
 
 
 def build_tools(
@@ -25,8 +177,56 @@ def build_tools(
     policy: ToolPolicy,
     *,
     include_high_intensity: bool = False,
+    async_client: AsyncSmashAPIClient | None = None,
 ) -> list[Any]:
-    @tool
+    """Build the agent's tools.
+
+    ``client`` should be the shared instance from ``get_client`` so every tool
+    set reuses one connection pool and HTTP cache. With ``async_client``,
+    each tool also gets a coroutine implementation so async agents
+    (``ainvoke``/``astream_events``) await httpx instead of parking a worker
+    thread on a blocking request.
+    """
+
+    def make_tool(func: Callable[..., str], coroutine: Callable[..., Awaitable[str]]) -> Any:
+        return StructuredTool.from_function(func=func, coroutine=coroutine if async_client is not None else None)
+
+    def ranking_result(
+        rows: Any,
+        *,
+        state: str,
+        intent: str,
+        months_back: int,
+        top_n: int,
+        min_entrants: int,
+    ) -> str:
+        if not isinstance(rows, list):
+            return _MISSING_RESULTS
+
+        ranked = run_ranking(rows, profile=RANKING_PROFILES[intent], top_n=top_n)
+        st = state.upper()
+        ranked["query"] = {
+            "state": st,
+            "intent": intent,
+            "months_back": months_back,
+            "videogame_id": ULTIMATE_VIDEOGAME_ID,
+            "top_n": top_n,
+            "limit": FULL_RESULT_LIMIT,
+            "filter_state": st,
+            "min_entrants": min_entrants,
+        }
+        return _json(ranked)
+
+    def with_resolution(data: dict[str, Any]) -> str:
+        count = int(data.get("count", 0))
+        resolution = policy.summarize_tournament_resolution(count)
+        if resolution:
+            data["agent_guidance"] = resolution
+        return _json(data)
+
+    ranking_cache = _new_cache(RANKING_CACHE_TTL_SECONDS)
+
+    @_cached_tool(ranking_cache)
     def rank_statewide_players(
         state: str,
         intent: RankingIntent = "strongest",
@@ -35,13 +235,40 @@ def build_tools(
         min_entrants: int = 32,
     ) -> str:
         """Rank statewide players by intent using weighted scoring. Intents: strongest, clutch, underrated, overrated, consistent, upset_heavy, activity_monsters. Returns top players with method transparency in JSON."""
-        if intent not in RANKING_PROFILES:
-            return (
-                f"Unsupported intent '{intent}'. "
-                f"Supported intents: {', '.join(sorted(RANKING_PROFILES.keys()))}."
+        if intent not in _INTENT_SET:
+            return f"Unsupported intent '{intent}'. Supported intents: {_SUPPORTED_INTENTS}."
+        try:
+            # Rows are decoded one at a time off the socket instead of from a fully buffered body.
+            rows = list(
+                client.iter_precomputed(
+                    state=state,
+                    months_back=months_back,
+                    videogame_id=ULTIMATE_VIDEOGAME_ID,
+                    limit=FULL_RESULT_LIMIT,
+                    filter_state=state,
+                    min_entrants=min_entrants,
+                )
+            )
+            return ranking_result(
+                rows, state=state, intent=intent, months_back=months_back, top_n=top_n, min_entrants=min_entrants
             )
+        except MissingResultsError:
+            return _MISSING_RESULTS
+        except SmashAPIError as err:
+            return f"Error calling /precomputed: {err}"
+
+    @_cached_tool(ranking_cache)
+    async def arank_statewide_players(
+        state: str,
+        intent: RankingIntent = "strongest",
+        months_back: int = 3,
+        top_n: int = 5,
+        min_entrants: int = 32,
+    ) -> str:
+        if intent not in _INTENT_SET:
+            return f"Unsupported intent '{intent}'. Supported intents: {_SUPPORTED_INTENTS}."
         try:
-            data = client.get_precomputed(
+            data = await async_client.get_precomputed(
                 state=state,
                 months_back=months_back,
                 videogame_id=ULTIMATE_VIDEOGAME_ID,
@@ -49,26 +276,17 @@ def build_tools(
                 filter_state=state,
                 min_entrants=min_entrants,
             )
-            rows = data.get("results", [])
-            if not isinstance(rows, list):
-                return "Error: /precomputed response missing list field 'results'."
-
-            ranked = run_ranking(rows, profile=RANKING_PROFILES[intent], top_n=top_n)
-            ranked["query"] = {
-                "state": state.upper(),
-                "intent": intent,
-                "months_back": months_back,
-                "videogame_id": ULTIMATE_VIDEOGAME_ID,
-                "top_n": top_n,
-                "limit": FULL_RESULT_LIMIT,
-                "filter_state": state.upper(),
-                "min_entrants": min_entrants,
-            }
-            return _json(ranked)
+            # Same shape check as iter_precomputed: a missing or non-list "results" is an error.
+            rows = data.get("results") if isinstance(data, dict) else None
+            return ranking_result(
+                rows, state=state, intent=intent, months_back=months_back, top_n=top_n, min_entrants=min_entrants
+            )
         except SmashAPIError as err:
             return f"Error calling /precomputed: {err}"
 
-    @tool
+    series_cache = _new_cache(LOOKUP_CACHE_TTL_SECONDS)
+
+    @_cached_tool(series_cache)
     def get_series_rankings(
         state: str,
         tournament_contains: str,
@@ -88,7 +306,28 @@ def build_tools(
         except SmashAPIError as err:
             return f"Error calling /precomputed_series: {err}"
 
-    @tool
+    @_cached_tool(series_cache)
+    async def aget_series_rankings(
+        state: str,
+        tournament_contains: str,
+        months_back: int = 3,
+        limit: int = 0,
+    ) -> str:
+        try:
+            data = await async_client.get_precomputed_series(
+                state=state,
+                tournament_contains=tournament_contains,
+                months_back=months_back,
+                videogame_id=ULTIMATE_VIDEOGAME_ID,
+                limit=limit,
+            )
+            return _json(data)
+        except SmashAPIError as err:
+            return f"Error calling /precomputed_series: {err}"
+
+    search_cache = _new_cache(LOOKUP_CACHE_TTL_SECONDS)
+
+    @_cached_tool(search_cache)
     def search_tournaments(
         state: str,
         tournament_contains: str,
@@ -104,15 +343,32 @@ def build_tools(
                 videogame_id=ULTIMATE_VIDEOGAME_ID,
                 limit=limit,
             )
-            count = int(data.get("count", 0))
-            resolution = policy.summarize_tournament_resolution(count)
-            if resolution:
-                data["agent_guidance"] = resolution
-            return _json(data)
+            return with_resolution(data)
         except SmashAPIError as err:
             return f"Error calling /tournaments: {err}"
 
-    @tool
+    @_cached_tool(search_cache)
+    async def asearch_tournaments(
+        state: str,
+        tournament_contains: str,
+        months_back: int = 3,
+        limit: int = 0,
+    ) -> str:
+        try:
+            data = await async_client.search_tournaments(
+                state=state,
+                tournament_contains=tournament_contains,
+                months_back=months_back,
+                videogame_id=ULTIMATE_VIDEOGAME_ID,
+                limit=limit,
+            )
+            return with_resolution(data)
+        except SmashAPIError as err:
+            return f"Error calling /tournaments: {err}"
+
+    lookup_cache = _new_cache(LOOKUP_CACHE_TTL_SECONDS)
+
+    @_cached_tool(lookup_cache)
     def lookup_tournament(tournament_slug: str) -> str:
         """Get tournament metadata by exact slug or start.gg URL. Low-intensity lookup; returns JSON."""
         try:
@@ -121,11 +377,23 @@ def build_tools(
         except SmashAPIError as err:
             return f"Error calling /tournaments/by-slug: {err}"
 
-    tools = [rank_statewide_players, get_series_rankings, search_tournaments, lookup_tournament]
+    @_cached_tool(lookup_cache)
+    async def alookup_tournament(tournament_slug: str) -> str:
+        try:
+            data = await async_client.lookup_tournament_by_slug(tournament_slug=tournament_slug)
+            return _json(data)
+        except SmashAPIError as err:
+            return f"Error calling /tournaments/by-slug: {err}"
+
+    tools = [
+        make_tool(rank_statewide_players, arank_statewide_players),
+        make_tool(get_series_rankings, aget_series_rankings),
+        make_tool(search_tournaments, asearch_tournaments),
+        make_tool(lookup_tournament, alookup_tournament),
+    ]
 
     if include_high_intensity:
 
-        @tool
         def get_tournament_player_analytics(
             tournament_slug: str,
             user_request: str,
@@ -147,6 +415,33 @@ def build_tools(
             except SmashAPIError as err:
                 return f"Error calling /search/by-slug: {err}"
 
-        tools.append(get_tournament_player_analytics)
+        async def aget_tournament_player_analytics(
+            tournament_slug: str,
+            user_request: str,
+            limit: int = 0,
+        ) -> str:
+            if not policy.should_allow_high_intensity(user_request):
+                return (
+                    "Policy blocked high-intensity /search/by-slug call. "
+                    "Use low-intensity tournament endpoints unless user explicitly asks for player analytics."
+                )
+            # Analytics and metadata for the same slug are independent; fetch them concurrently.
+            # The metadata lookup also warms lookup_tournament's cache for the agent's follow-up.
+            analytics, _ = await asyncio.gather(
+                async_client.search_by_slug(
+                    tournament_slug=tournament_slug,
+                    videogame_id=ULTIMATE_VIDEOGAME_ID,
+                    limit=limit,
+                ),
+                alookup_tournament(tournament_slug),
+                return_exceptions=True,
+            )
+            if isinstance(analytics, SmashAPIError):
+                return f"Error calling /search/by-slug: {analytics}"
+            if isinstance(analytics, BaseException):
+                raise analytics
+            return _json(analytics)
+
+        tools.append(make_tool(get_tournament_player_analytics, aget_tournament_player_analytics))
 
     return tools